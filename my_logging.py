@@ -1,15 +1,128 @@
 import sys
+import atexit
 import functools
 import io
+import json
 import logging
+import math
+import os
+import queue
+import reprlib
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from itertools import islice
+from operator import itemgetter
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any, Callable, Optional, Union, List
 
+try:
+    import orjson
+except ImportError:  # без orjson разбор JSON выполняет стандартный модуль json
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для пакетного solve_quadratic_batch
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # numba необязателен: без него ядро работает как обычная функция
+    def njit(**kwargs: Any) -> Callable:
+        return lambda fn: fn
+
 # тип для аргумента handle: либо Logger, либо объект с write()
 LoggerOrStream = Union[logging.Logger, io.TextIOBase]
 
+# валидаторы последнего ответа для условных запросов: url -> (ETag, Last-Modified, данные)
+_VALIDATORS: dict = {}
+
+class _LogRepr(reprlib.Repr):
+    """Усечённый repr для логов, сохраняющий порядок ключей словарей
+
+    Стандартный reprlib.Repr сортирует ключи, из-за чего в логе kwargs
+    и результаты выглядят не так, как их видит вызывающий код.
+    """
+
+    def repr_dict(self, x: dict, level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        newlevel = level - 1
+        repr1 = self.repr1
+        pieces = [f"{repr1(key, newlevel)}: {repr1(value, newlevel)}"
+                  for key, value in islice(x.items(), self.maxdict)]
+        if len(x) > self.maxdict:
+            pieces.append("...")
+        return "{" + ", ".join(pieces) + "}"
+
+    def short_str(self, obj: Any) -> str:
+        """Возвращает str(obj), усечённый до maxstring символов"""
+        text = str(obj)
+        if len(text) <= self.maxstring:
+            return text
+        i = max(0, (self.maxstring - 3) // 2)
+        j = max(0, self.maxstring - 3 - i)
+        return text[:i] + "..." + text[len(text) - j:]
+
+
+# усечённый repr для логов: большие аргументы и результаты не раздувают сообщения
+_REPR = _LogRepr()
+_REPR.maxstring = 200
+_REPR.maxother = 200
+_REPR.maxlong = 200
+_REPR.maxlist = _REPR.maxtuple = _REPR.maxset = _REPR.maxfrozenset = 10
+_REPR.maxdict = _REPR.maxdeque = _REPR.maxarray = 10
+
+
+class _Lazy:
+    """Откладывает вызов `f(*args)` до преобразования в строку
+
+    logging подставляет аргументы в сообщение только при форматировании
+    записи, поэтому для отключённых уровней repr не вычисляется вовсе.
+    """
+
+    __slots__ = ("f", "args")
+
+    def __init__(self, f: Callable, *args: Any):
+        self.f = f
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.f(*self.args)
+
+
+# допустимые числовые типы для курсов валют и коэффициентов
+_NUMERIC = (int, float)
+
+# общая сессия: keep-alive соединение и TLS-сессия переиспользуются между вызовами
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
+CBR_URL = "https://www.cbr-xml-daily.ru/daily_json.js"
 
-def logger(func: Optional[Callable] = None, *, handle: LoggerOrStream = sys.stdout):
+
+def _preconnect() -> None:
+    """Заранее устанавливает соединение и TLS-сессию с API ЦБ РФ
+
+    Ошибки игнорируются: настоящий запрос в get_currencies повторит попытку
+    """
+    try:
+        _SESSION.head(CBR_URL, timeout=2.0)
+    except requests.exceptions.RequestException:
+        pass
+
+
+# прогрев соединения в фоне; отключается переменной окружения CBR_PRECONNECT=0
+if os.environ.get("CBR_PRECONNECT", "1") != "0":
+    threading.Thread(target=_preconnect, daemon=True).start()
+
+
+def logger(func: Optional[Callable] = None, *, handle: LoggerOrStream = sys.stdout,
+           flush: bool = False, batch: bool = False):
     """Параметризуемый декоратор для логирования вызовов функций
 
     Поддерживает три режима логирования в зависимости от типа `handle`:
@@ -24,9 +137,18 @@ def logger(func: Optional[Callable] = None, *, handle: LoggerOrStream = sys.stdo
         - ERROR: исключение (тип и сообщение), после чего исключение
           пробрасывается дальше
 
+    Аргументы и результат записываются через усечённый repr (reprlib),
+    а сообщение исключения усекается до той же длины, поэтому большие
+    коллекции и строки не раздувают лог
+
     Args:
         func: Декорируемая функция (может быть None при использовании с аргументами)
         handle: Объект для записи логов (по умолчанию — sys.stdout)
+        flush: Вызывать ли `handle.flush()` после каждой записи в поток
+        batch: Писать ли в поток записи о входе и результате одним вызовом
+            `write()` после завершения функции. Вдвое меньше вызовов `write()`,
+            но запись о входе появляется только после вывода самой функции,
+            а вложенные вызовы логируются в обратном порядке
 
     Returns:
         Декорированную функцию с добавленным логированием
@@ -37,26 +159,81 @@ def logger(func: Optional[Callable] = None, *, handle: LoggerOrStream = sys.stdo
         if isinstance(handle, logging.Logger):
             info = handle.info
             error = handle.error
-        else:
-            def info(msg: str):
-                handle.write(f"INFO: {msg}\n")
+            name = fn.__name__
+            short_repr = _REPR.repr
+            short_str = _REPR.short_str
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                # repr строится, только когда запись действительно форматируется
+                info("Calling %s with args=%s, kwargs=%s",
+                     name, _Lazy(short_repr, args), _Lazy(short_repr, kwargs))
+                try:
+                    result = fn(*args, **kwargs)
+                    # логируем выход
+                    info("%s returned %s", name, _Lazy(short_repr, result))
+                    return result
+                except Exception as e:
+                    # логируем ошибку
+                    error("Function %s raised %s: %s",
+                          name, type(e).__name__, _Lazy(short_str, e))
+                    raise  # Пробрасываем исключение без изменений
+
+            return wrapper
+
+        write = handle.write
+        do_flush = getattr(handle, "flush", None) if flush else None
+        name = fn.__name__
+        short_repr = _REPR.repr
+        short_str = _REPR.short_str
+        entry_prefix = f"INFO: Calling {name} with args="
+        error_prefix = f"ERROR: Function {name} raised "
+        return_prefix = f"INFO: {name} returned "
+
+        if not batch:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                # логируем вход
+                write(f"{entry_prefix}{short_repr(args)}, kwargs={short_repr(kwargs)}\n")
+                if do_flush is not None:
+                    do_flush()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    # логируем ошибку
+                    write(f"{error_prefix}{type(e).__name__}: {short_str(e)}\n")
+                    if do_flush is not None:
+                        do_flush()
+                    raise  # Пробрасываем исключение без изменений
+                # логируем выход
+                write(f"{return_prefix}{short_repr(result)}\n")
+                if do_flush is not None:
+                    do_flush()
+                return result
 
-            def error(msg: str):
-                handle.write(f"ERROR: {msg}\n")
+            return wrapper
 
+        # batch=True: обе строки лога собираются в одну и пишутся одним write()
         @functools.wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # логируем вход
-            info(f"Calling {fn.__name__} with args={args}, kwargs={kwargs}")
+            entry = f"{entry_prefix}{short_repr(args)}, kwargs={short_repr(kwargs)}\n"
             try:
                 result = fn(*args, **kwargs)
-                # логируем выход
-                info(f"{fn.__name__} returned {result!r}")
-                return result
             except Exception as e:
-                # логируем ошибку
-                error(f"Function {fn.__name__} raised {type(e).__name__}: {e}")
+                write(f"{entry}{error_prefix}{type(e).__name__}: {short_str(e)}\n")
+                if do_flush is not None:
+                    do_flush()
                 raise  # Пробрасываем исключение без изменений
+            except BaseException:
+                # KeyboardInterrupt/SystemExit: запись о входе не должна потеряться
+                write(entry)
+                if do_flush is not None:
+                    do_flush()
+                raise
+            write(f"{entry}{return_prefix}{short_repr(result)}\n")
+            if do_flush is not None:
+                do_flush()
+            return result
 
         return wrapper
 
@@ -66,8 +243,94 @@ def logger(func: Optional[Callable] = None, *, handle: LoggerOrStream = sys.stdo
     return _decorate(func)
 
 
+def _ttl_cache(ttl: float) -> Callable:
+    """Декоратор мемоизации по позиционным аргументам с ограниченным временем жизни
+
+    Хранит пары (время сохранения, результат); по истечении `ttl` секунд
+    запись считается устаревшей и функция вызывается заново. Исключения
+    не кэшируются.
+
+    Args:
+        ttl: Время жизни записи в секундах
+
+    Returns:
+        Декоратор, добавляющий функции кэш и метод `cache_clear()`
+    """
+
+    def _decorate(fn: Callable) -> Callable:
+        cache: dict = {}
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any) -> Any:
+            now = time.monotonic()
+            entry = cache.get(args)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+            result = fn(*args)
+            cache[args] = (now, result)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return _decorate
+
+
+@_ttl_cache(ttl=600)
+def _fetch_raw(url: str) -> dict:
+    """Загружает и разбирает JSON с курсами валют
+
+    Результат кэшируется на 10 минут: данные ЦБ РФ обновляются раз в сутки.
+    После истечения кэша запрос отправляется с If-None-Match/If-Modified-Since,
+    и при ответе 304 повторно используются ранее разобранные данные
+
+    Args:
+        url: URL API для получения курсов
+
+    Returns:
+        dict: Разобранный JSON-ответ API
+
+    Raises:
+        ConnectionError: Если не удалось подключиться к API
+        ValueError: Если ответ не является корректным JSON
+    """
+    # условный запрос: если данные не изменились, сервер ответит 304 без тела
+    cached = _VALIDATORS.get(url)
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    try:
+        response = _SESSION.get(url, headers=headers, timeout=5.0)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise ConnectionError(f"Ошибка при запросе к API: {e}") from e
+
+    if response.status_code == 304 and cached is not None:
+        return cached[2]
+
+    try:
+        # разбираются байты тела напрямую, без промежуточного response.text
+        if orjson is not None:
+            data = orjson.loads(response.content)
+        else:
+            data = json.loads(response.content)
+    except ValueError as e:  # orjson.JSONDecodeError — подкласс ValueError
+        raise ValueError("Некорректный JSON в ответе API") from e
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _VALIDATORS[url] = (etag, last_modified, data)
+    return data
+
+
 def get_currencies(currency_codes: List[str],
-                   url: str = "https://www.cbr-xml-daily.ru/daily_json.js") -> dict:
+                   url: str = CBR_URL) -> dict:
     """Получает курсы валют по кодам с API ЦБ РФ
 
     Эта функция содержит только бизнес-логику и не выполняет логирование
@@ -85,29 +348,28 @@ def get_currencies(currency_codes: List[str],
         KeyError: Если отсутствует ключ "Valute" или запрашиваемая валюта
         TypeError: Если курс валюты не является числом
     """
-    try:
-        response = requests.get(url, timeout=5.0)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        raise ConnectionError(f"Ошибка при запросе к API: {e}") from e
-
-    try:
-        data = response.json()
-    except ValueError as e:
-        raise ValueError("Некорректный JSON в ответе API") from e
+    data = _fetch_raw(url)
 
     if "Valute" not in data:
         raise KeyError('В ответе JSON отсутствует ключ "Valute"')
 
     valute = data["Valute"]
-    result = {}
+    codes = tuple(currency_codes)
+    if not codes:
+        return {}
 
-    for code in currency_codes:
-        if code not in valute:
-            raise KeyError(f"Валюта '{code}' отсутствует в данных API")
+    # все записи о валютах извлекаются одним вызовом itemgetter на C-уровне
+    try:
+        entries = itemgetter(*codes)(valute)
+    except KeyError as e:
+        raise KeyError(f"Валюта '{e.args[0]}' отсутствует в данных API") from None
+    if len(codes) == 1:
+        entries = (entries,)
 
-        value = valute[code].get("Value")
-        if not isinstance(value, (int, float)):
+    result = {}
+    for code, entry in zip(codes, entries):
+        value = entry.get("Value")
+        if not isinstance(value, _NUMERIC):
             raise TypeError(f"Валюта '{code}' имеет нечисловой тип: {repr(value)}")
 
         result[code] = float(value)
@@ -132,16 +394,40 @@ def get_currencies_stringio(currency_codes: List[str]) -> dict:
     return get_currencies(currency_codes)
 
 
+def _attach_queue_handler(log: logging.Logger, handler: logging.Handler) -> QueueListener:
+    """Подключает `handler` к логгеру через очередь и фоновый поток
+
+    Текст сообщения (включая отложенные repr аргументов) по-прежнему
+    собирается в потоке вызывающего кода: QueueHandler.prepare() форматирует
+    запись перед помещением в очередь. В поток QueueListener переносится
+    только работа `handler` — применение его форматтера и запись на диск.
+
+    Args:
+        log: Логгер, к которому добавляется QueueHandler
+        handler: Целевой хендлер (например, FileHandler)
+
+    Returns:
+        QueueListener: Запущенный слушатель; его нужно остановить через stop()
+    """
+    log_queue = queue.SimpleQueue()
+    log.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 # логирование через logging.Logger в файл
 currency_file_logger = logging.getLogger("currency_file")
 currency_file_logger.setLevel(logging.INFO)
 
-# настройка файлового хендлера
+# настройка файлового хендлера (delay=True: файл открывается при первой записи)
 if not currency_file_logger.handlers:
-    file_handler = logging.FileHandler("currency.log", encoding="utf-8")
+    file_handler = logging.FileHandler("currency.log", encoding="utf-8", delay=True)
     formatter = logging.Formatter("%(levelname)s: %(message)s")
     file_handler.setFormatter(formatter)
-    currency_file_logger.addHandler(file_handler)
+    # запись на диск выполняется фоновым потоком; текст сообщения собирается до постановки в очередь
+    currency_listener = _attach_queue_handler(currency_file_logger, file_handler)
+    atexit.register(currency_listener.stop)
 
 
 @logger(handle=currency_file_logger)
@@ -154,10 +440,33 @@ quadratic_logger = logging.getLogger("quadratic")
 quadratic_logger.setLevel(logging.DEBUG)
 
 if not quadratic_logger.handlers:
-    quad_handler = logging.FileHandler("quadratic.log", encoding="utf-8")
+    quad_handler = logging.FileHandler("quadratic.log", encoding="utf-8", delay=True)
     quad_formatter = logging.Formatter("%(levelname)s: %(message)s")
     quad_handler.setFormatter(quad_formatter)
-    quadratic_logger.addHandler(quad_handler)
+    quad_listener = _attach_queue_handler(quadratic_logger, quad_handler)
+    atexit.register(quad_listener.stop)
+
+
+@njit(cache=True)
+def _solve_core(a: float, b: float, c: float) -> tuple:
+    """Вычислительное ядро solve_quadratic без проверок и логирования
+
+    Всегда возвращает кортеж фиксированной формы (x1, x2, count), где
+    count — число корней, а неиспользуемые позиции заполнены NaN:
+    nopython-режим numba не поддерживает возврат кортежей разной длины.
+    """
+    d = b * b - 4 * a * c
+    if d < 0:
+        return (math.nan, math.nan, 0)
+    elif d == 0:
+        return (-b / (2 * a), math.nan, 1)
+    else:
+        sqrt_d = d ** 0.5
+        return ((-b + sqrt_d) / (2 * a), (-b - sqrt_d) / (2 * a), 2)
+
+
+# исходная Python-версия ядра: у функции, скомпилированной numba, это py_func
+_solve_core_py = getattr(_solve_core, "py_func", _solve_core)
 
 
 @logger(handle=quadratic_logger)
@@ -181,20 +490,69 @@ def solve_quadratic(a: float, b: float, c: float) -> Optional[tuple]:
         ValueError: Если a == 0 (уравнение не квадратное).
     """
     for name, val in [("a", a), ("b", b), ("c", c)]:
-        if not isinstance(val, (int, float)):
+        if not isinstance(val, _NUMERIC):
             raise TypeError(f"Параметр '{name}' должен быть числом")
 
     if a == 0:
         raise ValueError("Коэффициент 'a' не может быть нулем")
 
-    d = b * b - 4 * a * c
-    if d < 0:
+    if _solve_core is _solve_core_py:
+        # без numba ядро — обычная функция с точной арифметикой Python
+        x1, x2, count = _solve_core(a, b, c)
+    else:
+        try:
+            # целые numba считает в int64, который молча переполняется
+            coeffs = (float(a), float(b), float(c))
+        except OverflowError:
+            # целые вне диапазона float: точная арифметика без JIT
+            x1, x2, count = _solve_core_py(a, b, c)
+        else:
+            x1, x2, count = _solve_core(*coeffs)
+            # +0.0 убирает -0.0, который даёт -b для float-нуля (как у целого -0)
+            x1, x2 = x1 + 0.0, x2 + 0.0
+    if count == 0:
         return None
-    elif d == 0:
-        return (-b / (2 * a),)
+    elif count == 1:
+        return (x1,)
     else:
-        sqrt_d = d ** 0.5
-        return ((-b + sqrt_d) / (2 * a), (-b - sqrt_d) / (2 * a))
+        return (x1, x2)
+
+
+def solve_quadratic_batch(a: Any, b: Any, c: Any) -> tuple:
+    """Решает набор квадратных уравнений a*x^2 + b*x + c = 0 без ветвлений
+
+    Коэффициенты обрабатываются как массивы NumPy за один проход:
+    дискриминант вычисляется поэлементно, а вместо if/elif по его знаку
+    используется маска. Логирование не выполняется — функция рассчитана
+    на массовые вычисления.
+
+    Args:
+        a: Массив (или скаляр) коэффициентов при x^2.
+        b: Массив (или скаляр) коэффициентов при x.
+        c: Массив (или скаляр) свободных членов.
+
+    Returns:
+        tuple: (roots1, roots2, mask), где mask — True там, где d >= 0;
+        при d < 0 корни равны NaN, при d == 0 roots1 и roots2 совпадают.
+
+    Raises:
+        ImportError: Если не установлен numpy.
+        ValueError: Если хотя бы один коэффициент a равен нулю.
+    """
+    if np is None:
+        raise ImportError("Для solve_quadratic_batch требуется numpy")
+
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+    if np.any(a == 0):
+        raise ValueError("Коэффициент 'a' не может быть нулем")
+
+    d = b * b - 4 * a * c
+    mask = d >= 0
+    sqrt_d = np.where(mask, np.sqrt(np.maximum(d, 0)), np.nan)
+    two_a = 2 * a
+    return (-b + sqrt_d) / two_a, (-b - sqrt_d) / two_a, mask
 
 
 # демонстрация при запуске напрямую
@@ -1,59 +1,136 @@
 import io
+import json
+import logging
+import math
+import os
+import pickle
 import unittest
 from unittest.mock import patch, Mock
 from requests.exceptions import RequestException
-from my_logging import get_currencies, logger
+
+# тесты не должны обращаться к сети при импорте модуля
+os.environ["CBR_PRECONNECT"] = "0"
+from my_logging import (get_currencies, logger, solve_quadratic, solve_quadratic_batch,
+                        _attach_queue_handler, _fetch_raw, _VALIDATORS, np)
+
+# исходная функция без декоратора: тесты не должны писать в quadratic.log
+_solve_quadratic = solve_quadratic.__wrapped__
+
+
+@logger(handle=io.StringIO())
+def _module_level(x):
+    """Декорированная функция уровня модуля для проверки pickle"""
+    return x
+
+
+def set_payload(mock_get, payload):
+    """Настраивает мок-ответ API: тело JSON передаётся как байты content"""
+    mock_get.return_value.content = json.dumps(payload).encode("utf-8")
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.headers = {}
 
 
 class TestGetCurrencies(unittest.TestCase):
     """Тесты бизнес-логики: проверка корректности возврата и всех требуемых исключений"""
 
-    @patch("my_logging.requests.get")
+    def setUp(self):
+        _fetch_raw.cache_clear()
+        _VALIDATORS.clear()
+
+    @patch("my_logging._SESSION.get")
     def test_returns_correct_data(self, mock_get):
         """Успешный сценарий: API возвращает корректные курсы → функция возвращает словарь"""
-        mock_get.return_value.json.return_value = {
+        set_payload(mock_get, {
             "Valute": {"USD": {"Value": 80.0}}
-        }
+        })
         result = get_currencies(["USD"])
         self.assertEqual(result, {"USD": 80.0})
 
-    @patch("my_logging.requests.get")
+    @patch("my_logging._SESSION.get")
     def test_missing_currency_raises_key_error(self, mock_get):
         """Запрос валюты, отсутствующей в ответе API → KeyError"""
-        mock_get.return_value.json.return_value = {"Valute": {}}
+        set_payload(mock_get, {"Valute": {}})
         with self.assertRaises(KeyError):
             get_currencies(["XYZ"])
 
-    @patch("my_logging.requests.get")
+    @patch("my_logging._SESSION.get")
+    def test_several_currencies(self, mock_get):
+        """Запрос нескольких валют → словарь со всеми курсами в порядке запроса"""
+        set_payload(mock_get, {
+            "Valute": {"USD": {"Value": 80.0}, "EUR": {"Value": 90}, "GBP": {"Value": 100.5}}
+        })
+        result = get_currencies(["EUR", "USD"])
+        self.assertEqual(result, {"EUR": 90.0, "USD": 80.0})
+
+    @patch("my_logging._SESSION.get")
     def test_no_valute_key_raises_key_error(self, mock_get):
         """Ответ API не содержит ключ 'Valute' → KeyError"""
-        mock_get.return_value.json.return_value = {"Date": "2025-01-01"}
+        set_payload(mock_get, {"Date": "2025-01-01"})
         with self.assertRaises(KeyError):
             get_currencies(["USD"])
 
-    @patch("my_logging.requests.get")
+    @patch("my_logging._SESSION.get")
     def test_invalid_json_raises_value_error(self, mock_get):
         """API возвращает некорректный JSON → ValueError"""
-        mock_get.return_value.json.side_effect = ValueError()
+        mock_get.return_value.content = b"{not json"
         with self.assertRaises(ValueError):
             get_currencies(["USD"])
 
-    @patch("my_logging.requests.get")
+    @patch("my_logging._SESSION.get")
     def test_non_numeric_rate_raises_type_error(self, mock_get):
         """Курс валюты не является числом (например, строка) → TypeError"""
-        mock_get.return_value.json.return_value = {
+        set_payload(mock_get, {
             "Valute": {"USD": {"Value": "abc"}}
-        }
+        })
         with self.assertRaises(TypeError):
             get_currencies(["USD"])
 
-    @patch("my_logging.requests.get")
+    @patch("my_logging._SESSION.get")
     def test_network_error_raises_connection_error(self, mock_get):
         """Сетевая ошибка → ConnectionError"""
         mock_get.side_effect = RequestException()
         with self.assertRaises(ConnectionError):
             get_currencies(["USD"])
 
+    @patch("my_logging._SESSION.get")
+    def test_repeated_calls_use_cache(self, mock_get):
+        """Повторный вызов в пределах TTL не выполняет новый HTTP-запрос"""
+        set_payload(mock_get, {
+            "Valute": {"USD": {"Value": 80.0}}
+        })
+        get_currencies(["USD"])
+        get_currencies(["USD"])
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("my_logging._SESSION.get")
+    def test_not_modified_reuses_previous_data(self, mock_get):
+        """Ответ 304 на условный запрос → используются ранее полученные данные"""
+        set_payload(mock_get, {
+            "Valute": {"USD": {"Value": 80.0}}
+        })
+        mock_get.return_value.headers = {"ETag": '"abc"'}
+        get_currencies(["USD"])
+
+        _fetch_raw.cache_clear()
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.content = b""
+        self.assertEqual(get_currencies(["USD"]), {"USD": 80.0})
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"abc"'})
+
+    @patch("my_logging.orjson", None)
+    @patch("my_logging._SESSION.get")
+    def test_stdlib_json_fallback(self, mock_get):
+        """Без orjson байты ответа разбираются стандартным json, ошибки → ValueError"""
+        set_payload(mock_get, {
+            "Valute": {"USD": {"Value": 80.0}}
+        })
+        self.assertEqual(get_currencies(["USD"]), {"USD": 80.0})
+
+        _fetch_raw.cache_clear()
+        mock_get.return_value.content = b"{not json"
+        with self.assertRaises(ValueError):
+            get_currencies(["USD"])
+
 
 class TestLoggerDecorator(unittest.TestCase):
     """Тесты декоратора logger: проверка логирования при успехе и ошибке"""
@@ -79,18 +156,213 @@ class TestLoggerDecorator(unittest.TestCase):
         self.assertIn("ERROR", log)
         self.assertIn("ValueError", log)
 
+    def test_wrapper_keeps_name_and_original(self):
+        """Обёртка сохраняет имя, docstring и ссылку на исходную функцию"""
+        def f(x):
+            """doc"""
+            return x
+        wrapped = logger(handle=io.StringIO())(f)
+        self.assertEqual(wrapped.__name__, "f")
+        self.assertEqual(wrapped.__doc__, "doc")
+        self.assertIs(wrapped.__wrapped__, f)
+
+    def test_wrapper_keeps_module_and_pickles(self):
+        """Функция из другого модуля сохраняет __module__ и сериализуется pickle"""
+        self.assertEqual(_module_level.__module__, __name__)
+        self.assertIs(pickle.loads(pickle.dumps(_module_level)), _module_level)
+
+    def test_large_arguments_are_truncated(self):
+        """Большие аргументы записываются в лог в усечённом виде"""
+        stream = io.StringIO()
+        @logger(handle=stream)
+        def f(x): return len(x)
+        f(list(range(100000)))
+        log = stream.getvalue()
+        self.assertIn("...", log)
+        self.assertLess(len(log), 500)
+
+    def test_small_collections_are_logged_in_full(self):
+        """Небольшие словари, кортежи аргументов и длинные целые не усекаются"""
+        stream = io.StringIO()
+        rates = {c: 1.0 for c in "gfedcba"}
+        @logger(handle=stream)
+        def f(*args, **kwargs): return rates
+        f(1, 2, 3, 4, 5, 6, 7, 10 ** 50, z=1, a=2, c=3, b=4, e=5)
+        log = stream.getvalue()
+        self.assertNotIn("...", log)
+        self.assertIn(repr(rates), log)
+        self.assertIn(repr((1, 2, 3, 4, 5, 6, 7, 10 ** 50)), log)
+        self.assertIn("kwargs={'z': 1, 'a': 2, 'c': 3, 'b': 4, 'e': 5}", log)
+
+    def test_long_exception_message_is_truncated(self):
+        """Длинное сообщение исключения записывается в усечённом виде"""
+        stream = io.StringIO()
+        @logger(handle=stream)
+        def bad(): raise ValueError("x" * 100000)
+        with self.assertRaises(ValueError):
+            bad()
+        log = stream.getvalue()
+        self.assertIn("ERROR: Function bad raised ValueError: xxx", log)
+        self.assertLess(len(log), 500)
+
+    def test_disabled_logger_skips_formatting(self):
+        """Если INFO отключён у Logger, аргументы и результат не форматируются"""
+        log = logging.getLogger("test_disabled")
+        log.setLevel(logging.ERROR)
+        calls = []
+
+        class Arg:
+            def __repr__(self):
+                calls.append(1)
+                return "Arg()"
+
+        @logger(handle=log)
+        def f(x): return x
+        f(Arg())
+        self.assertEqual(calls, [])
+
+    def test_base_exception_keeps_entry_line(self):
+        """При KeyboardInterrupt запись о входе всё равно попадает в поток"""
+        for batch in (False, True):
+            stream = io.StringIO()
+            @logger(handle=stream, batch=batch)
+            def g(): raise KeyboardInterrupt
+            with self.assertRaises(KeyboardInterrupt):
+                g()
+            self.assertEqual(stream.getvalue(), "INFO: Calling g with args=(), kwargs={}\n")
+
+    def test_nested_calls_logged_in_call_order(self):
+        """Вложенные вызовы: запись о входе пишется до вызова функции"""
+        stream = io.StringIO()
+        @logger(handle=stream)
+        def rec(n): return rec(n - 1) if n else 0
+        rec(1)
+        self.assertEqual(stream.getvalue().splitlines(), [
+            "INFO: Calling rec with args=(1,), kwargs={}",
+            "INFO: Calling rec with args=(0,), kwargs={}",
+            "INFO: rec returned 0",
+            "INFO: rec returned 0",
+        ])
+
+    def test_stream_single_write_per_call(self):
+        """При batch=True записи о входе и результате попадают в поток одним вызовом write()"""
+        handle = Mock()
+        @logger(handle=handle, batch=True)
+        def f(x): return x
+        f(1)
+        handle.write.assert_called_once()
+        handle.flush.assert_not_called()
+
+
+class TestQueueLogging(unittest.TestCase):
+    """Тесты записи через QueueHandler/QueueListener, как у файловых логгеров модуля"""
+
+    def test_records_keep_file_format(self):
+        """Сообщения декоратора доходят до целевого хендлера в формате 'LEVEL: message'"""
+        log = logging.getLogger("test_queue")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        target = io.StringIO()
+        handler = logging.StreamHandler(target)
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        listener = _attach_queue_handler(log, handler)
+        try:
+            @logger(handle=log)
+            def f(x):
+                if x < 0:
+                    raise ValueError("neg")
+                return x
+
+            f(1)
+            with self.assertRaises(ValueError):
+                f(-1)
+        finally:
+            listener.stop()
+            for h in list(log.handlers):
+                log.removeHandler(h)
+
+        self.assertEqual(target.getvalue().splitlines(), [
+            "INFO: Calling f with args=(1,), kwargs={}",
+            "INFO: f returned 1",
+            "INFO: Calling f with args=(-1,), kwargs={}",
+            "ERROR: Function f raised ValueError: neg",
+        ])
+
+
+class TestSolveQuadratic(unittest.TestCase):
+    """Тесты скалярного solve_quadratic: все варианты числа корней и ошибки"""
+
+    def test_two_roots(self):
+        """d > 0 → два корня"""
+        self.assertEqual(_solve_quadratic(1, -3, 2), (2.0, 1.0))
+
+    def test_one_root(self):
+        """d == 0 → один корень"""
+        self.assertEqual(_solve_quadratic(1, 2, 1), (-1.0,))
+
+    def test_no_roots(self):
+        """d < 0 → None"""
+        self.assertIsNone(_solve_quadratic(1, 0, 1))
+
+    def test_zero_a_raises_value_error(self):
+        """a == 0 → ValueError"""
+        with self.assertRaises(ValueError):
+            _solve_quadratic(0, 1, 1)
+
+    def test_non_numeric_raises_type_error(self):
+        """Нечисловой коэффициент → TypeError"""
+        with self.assertRaises(TypeError):
+            _solve_quadratic("a", 1, 2)
+
+    def test_large_int_coefficients(self):
+        """Большие целые не переполняются: b*b не помещается в int64, корней два"""
+        roots = _solve_quadratic(1, 4_000_000_000, 1)
+        self.assertEqual(len(roots), 2)
+        self.assertAlmostEqual(roots[1], -4e9)
+
+    def test_huge_int_coefficients(self):
+        """Целые вне диапазона float обрабатываются точно, без OverflowError"""
+        self.assertIsNone(_solve_quadratic(3, 1, 10 ** 400))
+        self.assertIsNone(_solve_quadratic(10 ** 400, 1, 1))
+
+    def test_zero_root_is_positive_zero(self):
+        """Для целых коэффициентов корень 0 возвращается как 0.0, а не -0.0"""
+        (root,) = _solve_quadratic(1, 0, 0)
+        self.assertEqual(math.copysign(1.0, root), 1.0)
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestSolveQuadraticBatch(unittest.TestCase):
+    """Тесты пакетного решения: совпадение с поэлементным solve_quadratic"""
+
+    def test_matches_scalar_solver(self):
+        """Корни и маска совпадают с результатами solve_quadratic для каждого уравнения"""
+        coeffs = [(1, -3, 2), (1, 2, 1), (1, 0, 1)]
+        a, b, c = zip(*coeffs)
+        roots1, roots2, mask = solve_quadratic_batch(a, b, c)
+        self.assertEqual(list(mask), [True, True, False])
+        self.assertEqual((roots1[0], roots2[0]), _solve_quadratic(1, -3, 2))
+        self.assertEqual((roots1[1],), _solve_quadratic(1, 2, 1))
+        self.assertTrue(roots1[2] != roots1[2])  # NaN
+
+    def test_zero_a_raises_value_error(self):
+        """Нулевой коэффициент a → ValueError, как и в скалярной версии"""
+        with self.assertRaises(ValueError):
+            solve_quadratic_batch([1, 0], [1, 1], [1, 1])
+
 
 class TestStreamWriteExample(unittest.TestCase):
     """Проверяет, что ошибка подключения корректно логируется и исключение пробрасывается"""
 
     def setUp(self):
+        _fetch_raw.cache_clear()
         self.stream = io.StringIO()
         @logger(handle=self.stream)
         def call_api():
             return get_currencies(["USD"])
         self.func = call_api
 
-    @patch("my_logging.requests.get")
+    @patch("my_logging._SESSION.get")
     def test_logs_connection_error(self, mock_get):
         """Имитация сетевой ошибки → проверка записи ERROR и проброса ConnectionError"""
         mock_get.side_effect = RequestException()